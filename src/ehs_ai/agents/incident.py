@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import List
+import asyncio
+from functools import lru_cache
+from typing import List, TypeVar
 
-from pydantic_ai import Agent as PydanticAgent, RunContext
+from pydantic import BaseModel
+from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
@@ -12,121 +15,203 @@ from ehs_ai.schemas import (
     IncidentReport,
     IntakeSummary,
     NotificationPlan,
-    PolicyReference,
     RootCauseAnalysis,
     TriageAssessment,
 )
+from ehs_ai.utils.http import get_http_client
 from ehs_ai.utils.logger import get_logger
+from ehs_ai.utils.rate_limit import estimate_tokens, get_rate_limiter
+from ehs_ai.vector.cache import SemanticCache
 from ehs_ai.vector.memory import VectorMemory
 
 logger = get_logger(__name__)
 
+OutputT = TypeVar("OutputT", bound=BaseModel)
 
-def _get_model() -> OpenAIChatModel:
+# Prompts keep their invariant text first and append only the per-incident tail, so the
+# leading tokens are byte-identical across requests and eligible for provider prefix caching.
+_INTAKE_SYSTEM_PROMPT = (
+    "You are an incident intake specialist for an Environmental Health & Safety team. "
+    "Summarize the report clearly, highlight key findings, note any injuries, and assign "
+    "a severity based on the description."
+)
+_INTAKE_PROMPT_PREFIX = "Process the following incident report and produce an intake summary.\n\n"
+
+_TRIAGE_SYSTEM_PROMPT = (
+    "You are an EHS triage officer. Based on the incident summary, "
+    "determine the risk level, immediate actions, escalation requirements, "
+    "and monitoring plan. Justify your recommendations."
+)
+_TRIAGE_PROMPT_PREFIX = "Perform triage on the incident using the following context.\n\n"
+
+_ROOT_CAUSE_SYSTEM_PROMPT = (
+    "You are a root cause analyst for EHS incidents. Provide plausible causes "
+    "and contributing factors. Highlight any gaps requiring further investigation."
+)
+_ROOT_CAUSE_PROMPT_PREFIX = "Analyse root causes using the following inputs.\n\n"
+
+_CORRECTIVE_SYSTEM_PROMPT = (
+    "You are responsible for proposing corrective actions after an EHS incident. "
+    "Outline actionable steps with responsible parties, target due dates, and cite "
+    "relevant policies or procedures."
+)
+_CORRECTIVE_PROMPT_PREFIX = "Develop a corrective action plan.\n\n"
+_NO_POLICY_CONTEXT = "No policies found. Base recommendations on best practice."
+
+_NOTIFICATION_SYSTEM_PROMPT = (
+    "You coordinate incident communications. Decide which tickets to create and "
+    "who to email, ensuring compliance with escalation protocol and data privacy guidelines."
+)
+_NOTIFICATION_PROMPT_PREFIX = "Create a notification plan for the incident.\n\n"
+_NOTIFICATION_REFINE_PREFIX = (
+    "Update the draft notification plan so tickets and emails reflect the final "
+    "corrective actions. Keep recipients and priorities unless the actions require changes.\n\n"
+)
+
+
+@lru_cache(maxsize=1)
+def _get_provider() -> OpenAIProvider:
     settings = get_settings()
     if not settings.openai_api_key:
         raise ValueError("OPENAI_API_KEY must be set for incident workflow agents.")
-    provider = OpenAIProvider(api_key=settings.openai_api_key)
-    return OpenAIChatModel(model_name=settings.openai_model, provider=provider)
+    return OpenAIProvider(api_key=settings.openai_api_key, http_client=get_http_client())
+
+
+@lru_cache(maxsize=None)
+def _get_model(role: str) -> OpenAIChatModel:
+    settings = get_settings()
+    return OpenAIChatModel(model_name=settings.model_for(role), provider=_get_provider())
+
+
+async def _run_agent(
+    agent: PydanticAgent, prefix: str, body: str, cache: SemanticCache[OutputT] | None
+) -> OutputT:
+    """Run an agent on ``prefix + body``, serving near-duplicate bodies from the semantic cache.
+
+    The cache is keyed on the per-incident ``body`` only: the invariant prefix would otherwise
+    consume the embedder's input window and make unrelated incidents look alike.
+    """
+    if cache is not None:
+        # Embedding and Chroma calls block, so keep them off the event loop.
+        try:
+            cached = await asyncio.to_thread(cache.get, body)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Semantic cache lookup failed: %s", exc)
+            cached = None
+        if cached is not None:
+            return cached
+    prompt = prefix + body
+    await get_rate_limiter().acquire(estimate_tokens(prompt))
+    result = await agent.run(prompt)
+    if cache is not None:
+        try:
+            await asyncio.to_thread(cache.put, body, result.output)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Semantic cache update failed: %s", exc)
+    return result.output
 
 
 class IntakeAgent:
     """Analyzes raw incident reports to produce structured intake summaries."""
 
-    def __init__(self) -> None:
-        self._agent = PydanticAgent(model=_get_model(), output_type=IntakeSummary)
-
-        @self._agent.system_prompt
-        def _system_prompt(_ctx: RunContext[IntakeSummary]) -> str:
-            return (
-                "You are an incident intake specialist for an Environmental Health & Safety team. "
-                "Summarize the report clearly, highlight key findings, note any injuries, and assign "
-                "a severity based on the description."
-            )
+    def __init__(self, *, cache: SemanticCache[IntakeSummary] | None = None) -> None:
+        self._agent = PydanticAgent(
+            model=_get_model("intake"),
+            output_type=IntakeSummary,
+            system_prompt=_INTAKE_SYSTEM_PROMPT,
+        )
+        self._cache = cache
 
     async def process(self, report: IncidentReport) -> IntakeSummary:
-        prompt = (
-            "Process the following incident report and produce an intake summary."
-            f"\n\nTitle: {report.title}"
-            f"\nReported By: {report.reported_by or 'Unknown'}"
-            f"\nLocation: {report.location or 'Not specified'}"
-            f"\nTime: {report.time_of_incident or 'Not specified'}"
-            f"\nIndividuals Involved: {', '.join(report.individuals_involved) or 'Not listed'}"
-            f"\nSeverity Hint: {report.severity_hint or 'None'}"
-            f"\nDescription:\n{report.description}"
+        body = "\n".join(
+            [
+                f"Title: {report.title}",
+                f"Reported By: {report.reported_by or 'Unknown'}",
+                f"Location: {report.location or 'Not specified'}",
+                f"Time: {report.time_of_incident or 'Not specified'}",
+                f"Individuals Involved: {', '.join(report.individuals_involved) or 'Not listed'}",
+                f"Severity Hint: {report.severity_hint or 'None'}",
+                f"Description:\n{report.description}",
+            ]
         )
-        result = await self._agent.run(prompt)
-        return result.output
+        return await _run_agent(self._agent, _INTAKE_PROMPT_PREFIX, body, self._cache)
 
 
 class TriageAgent:
     """Determines urgency, escalation paths, and immediate containment steps."""
 
-    def __init__(self) -> None:
-        self._agent = PydanticAgent(model=_get_model(), output_type=TriageAssessment)
-
-        @self._agent.system_prompt
-        def _system_prompt(_ctx: RunContext[TriageAssessment]) -> str:
-            return (
-                "You are an EHS triage officer. Based on the incident summary, "
-                "determine the risk level, immediate actions, escalation requirements, "
-                "and monitoring plan. Justify your recommendations."
-            )
+    def __init__(self, *, cache: SemanticCache[TriageAssessment] | None = None) -> None:
+        self._agent = PydanticAgent(
+            model=_get_model("triage"),
+            output_type=TriageAssessment,
+            system_prompt=_TRIAGE_SYSTEM_PROMPT,
+        )
+        self._cache = cache
 
     async def assess(self, report: IncidentReport, intake: IntakeSummary) -> TriageAssessment:
-        prompt = (
-            "Perform triage on the incident using the following context."
-            f"\n\nIncident title: {report.title}"
-            f"\nSeverity hint: {report.severity_hint or 'None'}"
-            f"\nIntake summary: {intake.narrative}"
-            f"\nKey findings: {', '.join(intake.key_findings)}"
-            f"\nInjuries or illnesses: {', '.join(intake.injuries_or_illnesses) or 'None'}"
+        body = "\n".join(
+            [
+                f"Incident title: {report.title}",
+                f"Severity hint: {report.severity_hint or 'None'}",
+                f"Intake summary: {intake.narrative}",
+                f"Key findings: {', '.join(intake.key_findings)}",
+                f"Injuries or illnesses: {', '.join(intake.injuries_or_illnesses) or 'None'}",
+            ]
         )
-        result = await self._agent.run(prompt)
-        return result.output
+        return await _run_agent(self._agent, _TRIAGE_PROMPT_PREFIX, body, self._cache)
 
 
 class RootCauseAgent:
     """Explores potential root causes and contributing factors."""
 
-    def __init__(self) -> None:
-        self._agent = PydanticAgent(model=_get_model(), output_type=RootCauseAnalysis)
-
-        @self._agent.system_prompt
-        def _system_prompt(_ctx: RunContext[RootCauseAnalysis]) -> str:
-            return (
-                "You are a root cause analyst for EHS incidents. Provide plausible causes "
-                "and contributing factors. Highlight any gaps requiring further investigation."
-            )
+    def __init__(self, *, cache: SemanticCache[RootCauseAnalysis] | None = None) -> None:
+        self._agent = PydanticAgent(
+            model=_get_model("root_cause"),
+            output_type=RootCauseAnalysis,
+            system_prompt=_ROOT_CAUSE_SYSTEM_PROMPT,
+        )
+        self._cache = cache
 
     async def analyse(
-        self, report: IncidentReport, intake: IntakeSummary, triage: TriageAssessment
+        self,
+        report: IncidentReport,
+        intake: IntakeSummary,
+        triage: TriageAssessment | None = None,
     ) -> RootCauseAnalysis:
-        prompt = (
-            "Analyse root causes using the following inputs."
-            f"\n\nDescription: {report.description}"
-            f"\nIntake summary: {intake.narrative}"
-            f"\nTriage rationale: {triage.rationale}"
-            f"\nImmediate actions: {', '.join(triage.priority_actions)}"
-        )
-        result = await self._agent.run(prompt)
-        return result.output
+        # Triage context is optional so the analysis can run alongside triage.
+        lines = [
+            f"Description: {report.description}",
+            f"Intake summary: {intake.narrative}",
+            f"Key findings: {', '.join(intake.key_findings) or 'None'}",
+        ]
+        if triage is not None:
+            lines.append(f"Triage rationale: {triage.rationale}")
+            lines.append(f"Immediate actions: {', '.join(triage.priority_actions)}")
+        body = "\n".join(lines)
+        return await _run_agent(self._agent, _ROOT_CAUSE_PROMPT_PREFIX, body, self._cache)
 
 
 class CorrectiveActionAgent:
     """Produces policy-aligned corrective actions leveraging vector memory."""
 
     def __init__(self, *, vector_memory: VectorMemory) -> None:
-        self._agent = PydanticAgent(model=_get_model(), output_type=CorrectiveActionPlan)
+        self._agent = PydanticAgent(
+            model=_get_model("corrective"),
+            output_type=CorrectiveActionPlan,
+            system_prompt=_CORRECTIVE_SYSTEM_PROMPT,
+        )
         self._memory = vector_memory
 
-        @self._agent.system_prompt
-        def _system_prompt(_ctx: RunContext[CorrectiveActionPlan]) -> str:
-            return (
-                "You are responsible for proposing corrective actions after an EHS incident. "
-                "Outline actionable steps with responsible parties, target due dates, and cite "
-                "relevant policies or procedures."
-            )
+    def retrieve_policies(self, report: IncidentReport, intake: IntakeSummary) -> List[str]:
+        """Look up formatted policy context from the report and intake findings.
+
+        Blocking (embedding + vector search); the workflow graph runs it in a worker thread
+        alongside triage and root cause analysis.
+        """
+        return self._memory.query_formatted(
+            text=f"{report.description}\n{intake.narrative}\n{','.join(intake.key_findings)}",
+            n_results=4,
+        )
 
     async def plan(
         self,
@@ -134,45 +219,36 @@ class CorrectiveActionAgent:
         intake: IntakeSummary,
         triage: TriageAssessment,
         root_cause: RootCauseAnalysis,
+        policy_hits: List[str] | None = None,
     ) -> CorrectiveActionPlan:
-        policy_matches = self._memory.query(
-            text=f"{report.description}\n{intake.narrative}\n{','.join(root_cause.primary_causes)}",
-            n_results=4,
-        )
-        policy_context = "\n".join(
-            f"- {item['metadata'].get('tag', 'policy')}: {item['document']}"
-            for item in policy_matches
-        )
-        prompt = (
-            "Develop a corrective action plan."
-            f"\n\nIncident summary: {intake.narrative}"
-            f"\nRoot causes: {', '.join(root_cause.primary_causes)}"
-            f"\nContributing factors: {', '.join(root_cause.contributing_factors) or 'None'}"
-            f"\nTriage actions already underway: {', '.join(triage.priority_actions)}"
-            f"\nRelevant policies:\n{policy_context or 'No policies found. Base recommendations on best practice.'}"
+        if policy_hits is None:
+            causes = ",".join(root_cause.primary_causes)
+            policy_hits = self._memory.query_formatted(
+                text=f"{report.description}\n{intake.narrative}\n{causes}", n_results=4
+            )
+        policy_context = "\n".join(policy_hits)
+        body = "\n".join(
+            [
+                f"Incident summary: {intake.narrative}",
+                f"Root causes: {', '.join(root_cause.primary_causes)}",
+                f"Contributing factors: {', '.join(root_cause.contributing_factors) or 'None'}",
+                f"Triage actions already underway: {', '.join(triage.priority_actions)}",
+                f"Relevant policies:\n{policy_context or _NO_POLICY_CONTEXT}",
+            ]
         )
-        result = await self._agent.run(prompt)
-        plan = result.output
-        # Enrich policy references to include explicit metadata.
-        enriched_refs: List[PolicyReference] = []
-        for ref in plan.policy_references:
-            enriched_refs.append(ref)
-        plan.policy_references = enriched_refs
-        return plan
+        return await _run_agent(self._agent, _CORRECTIVE_PROMPT_PREFIX, body, None)
 
 
 class NotificationAgent:
     """Determines which stakeholders to notify and which artifacts to create."""
 
-    def __init__(self) -> None:
-        self._agent = PydanticAgent(model=_get_model(), output_type=NotificationPlan)
-
-        @self._agent.system_prompt
-        def _system_prompt(_ctx: RunContext[NotificationPlan]) -> str:
-            return (
-                "You coordinate incident communications. Decide which tickets to create and "
-                "who to email, ensuring compliance with escalation protocol and data privacy guidelines."
-            )
+    def __init__(self, *, cache: SemanticCache[NotificationPlan] | None = None) -> None:
+        self._agent = PydanticAgent(
+            model=_get_model("notification"),
+            output_type=NotificationPlan,
+            system_prompt=_NOTIFICATION_SYSTEM_PROMPT,
+        )
+        self._cache = cache
 
     async def plan(
         self,
@@ -181,15 +257,27 @@ class NotificationAgent:
         triage: TriageAssessment,
         corrective_actions: CorrectiveActionPlan,
     ) -> NotificationPlan:
-        prompt = (
-            "Create a notification plan for the incident."
-            f"\n\nIncident title: {report.title}"
-            f"\nLocation: {report.location or 'Not specified'}"
-            f"\nSeverity: {intake.severity}"
-            f"\nTriage risk level: {triage.risk_level}"
-            f"\nKey actions: {', '.join(corrective_actions.actions)}"
-            f"\nResponsible parties: {', '.join(corrective_actions.responsible_parties)}"
+        body = "\n".join(
+            [
+                f"Incident title: {report.title}",
+                f"Location: {report.location or 'Not specified'}",
+                f"Severity: {intake.severity}",
+                f"Triage risk level: {triage.risk_level}",
+                f"Key actions: {', '.join(corrective_actions.actions)}",
+                f"Responsible parties: {', '.join(corrective_actions.responsible_parties)}",
+            ]
         )
-        result = await self._agent.run(prompt)
-        return result.output
+        return await _run_agent(self._agent, _NOTIFICATION_PROMPT_PREFIX, body, self._cache)
 
+    async def refine(
+        self, draft: NotificationPlan, corrective_actions: CorrectiveActionPlan
+    ) -> NotificationPlan:
+        """Reconcile a draft plan built from triage actions with the final corrective plan."""
+        body = "\n".join(
+            [
+                f"Draft plan (JSON): {draft.model_dump_json()}",
+                f"Key actions: {', '.join(corrective_actions.actions)}",
+                f"Responsible parties: {', '.join(corrective_actions.responsible_parties)}",
+            ]
+        )
+        return await _run_agent(self._agent, _NOTIFICATION_REFINE_PREFIX, body, self._cache)
@@ -21,16 +21,49 @@ class Settings(BaseSettings):
     # LLM configuration (pydantic-ai / OpenAI)
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o-mini")
+    openai_max_requests_per_min: int = Field(default=5000)
+    openai_max_tokens_per_min: int = Field(default=15_000_000)
+
+    # Optional per-agent model overrides; unset roles fall back to ``openai_model``.
+    intake_model: Optional[str] = Field(default=None)
+    triage_model: Optional[str] = Field(default=None)
+    root_cause_model: Optional[str] = Field(default=None)
+    corrective_model: Optional[str] = Field(default=None)
+    notification_model: Optional[str] = Field(default=None)
 
     # Vector memory configuration
     vector_db_path: Path = Field(default=Path("./storage/vector_db"))
+    vector_backend: Literal["chroma", "faiss"] = Field(default="chroma")
+    # Storage precision for the flat ("faiss") backend; Chroma always keeps float32.
+    vector_quantization: Literal["none", "fp16", "int8"] = Field(default="none")
     vector_collection: str = Field(default="ehs_policies")
     embedding_model_name: str = Field(default="sentence-transformers/all-MiniLM-L6-v2")
+    embedding_backend: Literal["torch", "onnx", "transformers"] = Field(default="torch")
+
+    # Semantic response cache for incident agents
+    semantic_cache_enabled: bool = Field(default=False)
+    semantic_cache_threshold: float = Field(default=0.92)
+    semantic_cache_max_entries: int = Field(default=512)
+
+    # Evidence image analysis cache (perceptual-hash lookup)
+    # Opt-in: near-identical photos from different incidents share one analysis.
+    evidence_cache_enabled: bool = Field(default=False)
+    evidence_cache_max_distance: float = Field(default=0.15)
+    evidence_cache_ttl_hours: float = Field(default=168)
+
+    # Incident workflow orchestration
+    # Draft notifications from triage while corrective planning runs (opt-in: costs a
+    # refine call whenever the final plan names owners the draft does not address).
+    speculative_notifications: bool = Field(default=False)
 
     # FastAPI server
     api_host: str = Field(default="0.0.0.0")
     api_port: int = Field(default=8000)
 
+    def model_for(self, role: str) -> str:
+        """Return the model configured for an agent role, defaulting to ``openai_model``."""
+        return getattr(self, f"{role}_model", None) or self.openai_model
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from io import BytesIO
-import uuid
 import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import FileResponse, Response
 
 from pydantic import ValidationError
 
@@ -18,30 +19,69 @@ from ehs_ai.agents.incident import (
 )
 from ehs_ai.config import get_settings
 from ehs_ai.reporting.pdf import generate_incident_pdf
-from ehs_ai.schemas import IncidentReport, IncidentWorkflowReport
+from ehs_ai.schemas import (
+    EvidenceItem,
+    IncidentReport,
+    IncidentWorkflowReport,
+    IntakeSummary,
+    NotificationPlan,
+    RootCauseAnalysis,
+    TriageAssessment,
+)
 from ehs_ai.services.evidence import EvidenceStorage
 from ehs_ai.services.evidence_analyzer import EvidenceAnalyzer
 from ehs_ai.services.incident_workflow import IncidentWorkflowService
 from ehs_ai.services.notifications import NotificationService
 from ehs_ai.utils.logger import get_logger
-from ehs_ai.vector.memory import VectorMemory
+from ehs_ai.vector.cache import ImageAnalysisCache, SemanticCache
+from ehs_ai.vector.memory import get_vector_memory
 
 logger = get_logger(__name__)
 
 settings = get_settings()
-vector_memory = VectorMemory()
+vector_memory = get_vector_memory()
 vector_memory.ensure_seed_documents()
 
 evidence_storage = EvidenceStorage()
-evidence_analyzer = EvidenceAnalyzer()
+evidence_analyzer = EvidenceAnalyzer(
+    cache=(
+        ImageAnalysisCache(
+            vector_memory,
+            max_distance=settings.evidence_cache_max_distance,
+            ttl_seconds=settings.evidence_cache_ttl_hours * 3600,
+        )
+        if settings.evidence_cache_enabled
+        else None
+    )
+)
+
+
+def _agent_cache(name: str, output_type: type) -> SemanticCache | None:
+    if not settings.semantic_cache_enabled:
+        return None
+    return SemanticCache(
+        vector_memory,
+        name=name,
+        output_type=output_type,
+        threshold=settings.semantic_cache_threshold,
+        max_entries=settings.semantic_cache_max_entries,
+    )
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Warm the embedder before serving so cold-start cost stays out of the first request.
+    await asyncio.to_thread(vector_memory.warmup)
+    yield
+
 
-app = FastAPI(title="EHS Incident Assistant", version="0.3.2")
+app = FastAPI(title="EHS Incident Assistant", version="0.3.2", lifespan=_lifespan)
 incident_workflow_service = IncidentWorkflowService(
-    intake_agent=IntakeAgent(),
-    triage_agent=TriageAgent(),
-    root_cause_agent=RootCauseAgent(),
+    intake_agent=IntakeAgent(cache=_agent_cache("intake", IntakeSummary)),
+    triage_agent=TriageAgent(cache=_agent_cache("triage", TriageAssessment)),
+    root_cause_agent=RootCauseAgent(cache=_agent_cache("root_cause", RootCauseAnalysis)),
     corrective_agent=CorrectiveActionAgent(vector_memory=vector_memory),
-    notification_agent=NotificationAgent(),
+    notification_agent=NotificationAgent(cache=_agent_cache("notification", NotificationPlan)),
     notification_service=NotificationService(),
 )
 
@@ -51,7 +91,7 @@ async def health() -> dict:
     return {"status": "ok", "environment": settings.environment}
 
 
-@app.post("/incident-workflow", response_class=StreamingResponse)
+@app.post("/incident-workflow", response_class=Response)
 async def incident_workflow(
     incident: str | None = Form(
         default=None, description="Optional JSON-encoded IncidentReport payload"
@@ -60,28 +100,28 @@ async def incident_workflow(
     evidence: list[UploadFile] = File(
         default_factory=list, description="Optional incident evidence files"
     ),
-) -> StreamingResponse:
+) -> Response:
     if incident is None and message is None and not evidence:
         raise HTTPException(status_code=400, detail="Provide an incident payload, message, or evidence.")
 
     report = await _prepare_incident_report(incident_json=incident, message=message)
-
     incident_id = uuid.uuid4().hex
-    saved_records = await evidence_storage.save(incident_id=incident_id, files=evidence)
-
-    evidence_items = []
-    analyses = []
-    if saved_records:
-        analysis_tasks = []
-        for item, rel_name in saved_records:
-            path = evidence_storage.resolve(incident_id, rel_name)
-            evidence_items.append((item, path))
-            analysis_tasks.append(asyncio.create_task(evidence_analyzer.analyse(path)))
-        analyses = await asyncio.gather(*analysis_tasks, return_exceptions=True)
-        for (item, _), analysis in zip(evidence_items, analyses, strict=False):
-            item.analysis = analysis if isinstance(analysis, str) else "Analysis failed."
-
-    evidence_models = [item for item, _ in evidence_items]
+
+    # With a reporter narrative, intake can start on the base description while evidence is
+    # stored and analysed; evidence-only submissions need the analysis to build a narrative.
+    intake_task = None
+    has_narrative = bool(incident) or bool(message and message.strip())
+    if evidence and has_narrative:
+        intake_task = asyncio.create_task(
+            incident_workflow_service.intake_only(report.model_copy(deep=True))
+        )
+
+    try:
+        evidence_models = await _process_evidence(incident_id=incident_id, files=evidence)
+    except BaseException:
+        if intake_task is not None:
+            intake_task.cancel()
+        raise
     if evidence_models:
         report.attachments = [evidence.url for evidence in evidence_models]
         summary_lines = [item.analysis for item in evidence_models if item.analysis]
@@ -90,7 +130,13 @@ async def incident_workflow(
             report.description = f"{report.description}\n\nEvidence Insights:\n{summary}".strip()
 
     try:
-        result: IncidentWorkflowReport = await incident_workflow_service.run(report)
+        if intake_task is not None:
+            intake = await intake_task
+            result: IncidentWorkflowReport = await incident_workflow_service.continue_after_intake(
+                report, intake
+            )
+        else:
+            result = await incident_workflow_service.run(report)
     except Exception as exc:  # pylint: disable=broad-except
         logger.exception("Incident workflow execution failed: %s", exc)
         raise HTTPException(status_code=500, detail="Incident workflow failed.") from exc
@@ -103,7 +149,24 @@ async def incident_workflow(
         "X-Triage-Risk": result.triage.risk_level,
         "X-Incident-Title": result.incident.title,
     }
-    return StreamingResponse(BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+
+async def _process_evidence(*, incident_id: str, files: list[UploadFile]) -> list[EvidenceItem]:
+    saved_records = await evidence_storage.save(incident_id=incident_id, files=files)
+    if not saved_records:
+        return []
+    evidence_items = [item for item, _ in saved_records]
+    paths = [evidence_storage.resolve(incident_id, rel_name) for _, rel_name in saved_records]
+    try:
+        # One vision request covers every attachment instead of one round-trip per file.
+        analyses = await evidence_analyzer.analyse_many(paths)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("Evidence analysis failed: %s", exc)
+        analyses = ["Analysis failed."] * len(evidence_items)
+    for item, analysis in zip(evidence_items, analyses, strict=False):
+        item.analysis = analysis
+    return evidence_items
 
 
 async def _prepare_incident_report(
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import Iterable, List
+import re
 import unicodedata
 
 from fpdf import FPDF
@@ -15,6 +16,38 @@ from ehs_ai.schemas import (
 )
 
 
+_REPLACEMENTS = {
+    "→": "->",
+    "←": "<-",
+    "↔": "<->",
+    "–": "-",
+    "—": "-",
+    "−": "-",
+    "•": "-",
+    "·": "-",
+    "“": '"',
+    "”": '"',
+    "„": '"',
+    "‟": '"',
+    "’": "'",
+    "‘": "'",
+    "‛": "'",
+    "…": "...",
+    " ": " ",
+    " ": " ",
+}
+# Built once at import: typographic replacements plus control characters (other than
+# newline, carriage return and tab) mapped to spaces, applied in a single str.translate pass.
+_TRANSLATE_TABLE = str.maketrans(
+    {
+        **{ord(ch): replacement for ch, replacement in _REPLACEMENTS.items()},
+        **{code: " " for code in range(32) if chr(code) not in "\n\r\t"},
+    }
+)
+# Anything still outside printable ASCII after latin-1 encoding is rendered as "?".
+_INVALID_RE = re.compile(r"[^\x20-\x7e\n\r\t]")
+
+
 class IncidentPDF(FPDF):
     """Customised FPDF wrapper for incident workflow reports."""
 
@@ -40,17 +73,27 @@ class IncidentPDF(FPDF):
         if not items:
             self.cell(0, 6, "- None", ln=1)
             return
+        self.add_bullet_iter(items)
+
+    def add_bullet_iter(self, items: Iterable[str], *, empty: str = "None") -> None:
+        """Emit bullets as the iterable is consumed; ``empty`` is rendered if it yields nothing."""
+        emitted = False
         for item in items:
-            lines = _wrap_lines(item)
-            for idx, line in enumerate(lines):
-                prefix = "- " if idx == 0 else "  "
-                self.cell(0, 6, f"{prefix}{line}", ln=1)
+            self._add_bullet(item)
+            emitted = True
+        if not emitted:
+            self._add_bullet(empty)
         self.ln(1)
 
+    def _add_bullet(self, item: str) -> None:
+        for idx, line in enumerate(_wrap_sanitized(_sanitize(item))):
+            prefix = "- " if idx == 0 else "  "
+            self.cell(0, 6, f"{prefix}{line}", ln=1)
+
     def add_wrapped_text(self, text: str | None) -> None:
         sanitized = _sanitize(text if text else "")
         self.set_font("Helvetica", size=11)
-        for line in _wrap_lines(sanitized):
+        for line in _wrap_sanitized(sanitized):
             self.cell(0, 6, line, ln=1)
         self.ln(1)
 
@@ -78,37 +121,38 @@ def _render_corrective_actions(pdf: IncidentPDF, corrective: CorrectiveActionPla
 
 def _render_notifications(pdf: IncidentPDF, notifications: NotificationResult) -> None:
     pdf.add_section_title("Notification Plan - Tickets")
-    ticket_lines = [
-        f"{ticket.request.title} (Priority: {ticket.request.priority}) -> {ticket.ticket_id} [{ticket.status}]"
-        for ticket in notifications.tickets
-    ]
-    pdf.add_bullet_list(ticket_lines or ["No tickets created"])
+    pdf.add_bullet_iter(
+        (
+            f"{ticket.request.title} (Priority: {ticket.request.priority}) "
+            f"-> {ticket.ticket_id} [{ticket.status}]"
+            for ticket in notifications.tickets
+        ),
+        empty="No tickets created",
+    )
     pdf.ln(2)
     pdf.add_section_title("Notification Plan - Emails")
-    email_lines = [
-        f"{email.request.recipient} | {email.request.subject} -> {email.status}"
-        for email in notifications.emails
-    ]
-    pdf.add_bullet_list(email_lines or ["No emails sent"])
+    pdf.add_bullet_iter(
+        (
+            f"{email.request.recipient} | {email.request.subject} -> {email.status}"
+            for email in notifications.emails
+        ),
+        empty="No emails sent",
+    )
     if notifications.notes:
         pdf.ln(2)
         pdf.add_wrapped_text(f"Notes: {notifications.notes}")
 
 
-def _wrap_lines(text: str | None, width: int = 90) -> List[str]:
-    """Break text into chunks so each line renders safely within the page width."""
-    sanitized = _sanitize(text if text is not None else "")
-    if not sanitized:
+def _wrap_sanitized(text: str, width: int = 90) -> List[str]:
+    """Break already-sanitized text into lines that render safely within the page width."""
+    if not text:
         return [""]
     lines: List[str] = []
-    for raw_line in sanitized.splitlines() or [sanitized]:
+    for raw_line in text.splitlines():
         if not raw_line:
             lines.append("")
             continue
-        start = 0
-        while start < len(raw_line):
-            lines.append(raw_line[start : start + width])
-            start += width
+        lines.extend(raw_line[start : start + width] for start in range(0, len(raw_line), width))
     return lines or [""]
 
 
@@ -116,55 +160,25 @@ def _sanitize(value: str | None) -> str:
     """Convert text to a latin-1-friendly representation, replacing problem characters."""
     if value is None:
         return ""
-    replacements = {
-        "→": "->",
-        "←": "<-",
-        "↔": "<->",
-        "–": "-",
-        "—": "-",
-        "−": "-",
-        "•": "-",
-        "·": "-",
-        "“": '"',
-        "”": '"',
-        "„": '"',
-        "‟": '"',
-        "’": "'",
-        "‘": "'",
-        "‛": "'",
-        "…": "...",
-        " ": " ",
-        " ": " ",
-    }
-    normalized = unicodedata.normalize("NFKC", str(value))
-    translated_chars: List[str] = []
-    for ch in normalized:
-        if ch in replacements:
-            translated_chars.append(replacements[ch])
-        elif ord(ch) < 32 and ch not in "\n\r\t":
-            translated_chars.append(" ")
-        else:
-            translated_chars.append(ch)
-    joined = "".join(translated_chars)
+    joined = unicodedata.normalize("NFKC", str(value)).translate(_TRANSLATE_TABLE)
     ascii_bytes = joined.encode("latin-1", "replace")
     ascii_str = ascii_bytes.decode("latin-1")
-    cleaned = "".join(ch if (32 <= ord(ch) < 127) or ch in "\n\r\t" else "?" for ch in ascii_str)
+    cleaned = _INVALID_RE.sub("?", ascii_str)
     return cleaned.strip()
 
 
 def _render_evidence(pdf: IncidentPDF, evidence: Iterable[EvidenceItem]) -> None:
     pdf.add_section_title("Evidence")
-    evidence = list(evidence)
-    if not evidence:
-        pdf.add_bullet_list(["No evidence uploaded."])
-        return
-    lines = []
-    for item in evidence:
-        base = f"{item.filename} ({_format_size(item.size_bytes)}) -> {item.url}"
-        if item.analysis:
-            base += f" | Analysis: {item.analysis}"
-        lines.append(base)
-    pdf.add_bullet_list(lines)
+    pdf.add_bullet_iter(
+        (_format_evidence_item(item) for item in evidence), empty="No evidence uploaded."
+    )
+
+
+def _format_evidence_item(item: EvidenceItem) -> str:
+    base = f"{item.filename} ({_format_size(item.size_bytes)}) -> {item.url}"
+    if item.analysis:
+        base += f" | Analysis: {item.analysis}"
+    return base
 
 
 def _format_size(size_bytes: int) -> str:
@@ -179,7 +193,6 @@ def _format_size(size_bytes: int) -> str:
 
 def generate_incident_pdf(report: IncidentWorkflowReport) -> bytes:
     """Render the workflow report as a PDF document."""
-
     pdf = IncidentPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
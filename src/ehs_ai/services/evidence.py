@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import uuid
+import asyncio
+import re
+import secrets
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
@@ -11,14 +13,22 @@ from ehs_ai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_DISALLOWED_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]")
+
 
 class EvidenceStorage:
     """Handles persistent storage of incident evidence files."""
 
-    def __init__(self, root: Path | None = None, max_bytes: int = 5 * 1024 * 1024) -> None:
+    def __init__(
+        self,
+        root: Path | None = None,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_concurrent_writes: int = 4,
+    ) -> None:
         self._root = root or Path("./storage/evidence")
         self._root.mkdir(parents=True, exist_ok=True)
         self._max_bytes = max_bytes
+        self._max_concurrent_writes = max_concurrent_writes
 
     @property
     def root(self) -> Path:
@@ -29,8 +39,16 @@ class EvidenceStorage:
         incident_dir = self._root / incident_id
         incident_dir.mkdir(parents=True, exist_ok=True)
 
-        for upload in files:
-            size, rel_name = await self._write_file(incident_dir, upload)
+        # Write uploads concurrently, bounded to avoid exhausting file descriptors.
+        semaphore = asyncio.Semaphore(self._max_concurrent_writes)
+
+        async def _bounded_write(upload: UploadFile) -> tuple[int | None, str]:
+            async with semaphore:
+                return await self._write_file(incident_dir, upload)
+
+        uploads = list(files)
+        written = await asyncio.gather(*(_bounded_write(upload) for upload in uploads))
+        for upload, (size, rel_name) in zip(uploads, written, strict=True):
             if size is None:
                 continue
             item = EvidenceItem(
@@ -47,30 +65,23 @@ class EvidenceStorage:
     async def _write_file(self, incident_dir: Path, upload: UploadFile) -> tuple[int | None, str]:
         filename = upload.filename or "evidence"
         sanitized = _sanitize_filename(filename)
-        unique_name = f"{uuid.uuid4().hex}_{sanitized}"
+        unique_name = f"{secrets.token_hex(16)}_{sanitized}"
         target_path = incident_dir / unique_name
 
-        total = 0
         try:
-            with target_path.open("wb") as buffer:
-                while True:
-                    chunk = await upload.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    total += len(chunk)
-                    if total > self._max_bytes:
-                        logger.warning("Evidence file %s exceeds size limit; skipping save.", filename)
-                        await upload.close()
-                        target_path.unlink(missing_ok=True)
-                        return None, unique_name
-                    buffer.write(chunk)
+            # Uploads are capped at max_bytes, so one bounded read replaces the chunk loop.
+            data = await upload.read(self._max_bytes + 1)
         finally:
             await upload.close()
 
-        return total, unique_name
+        if len(data) > self._max_bytes:
+            logger.warning("Evidence file %s exceeds size limit; skipping save.", filename)
+            return None, unique_name
+        # Disk writes run in a worker thread so they don't block the event loop.
+        await asyncio.to_thread(target_path.write_bytes, data)
+        return len(data), unique_name
 
 
 def _sanitize_filename(name: str) -> str:
-    allowed = [ch if ch.isalnum() or ch in {".", "-", "_"} else "_" for ch in name]
-    sanitized = "".join(allowed).strip("._")
+    sanitized = _DISALLOWED_FILENAME_RE.sub("_", name).strip("._")
     return sanitized or "evidence"
@@ -1,77 +1,296 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, UnidentifiedImageError
 from openai import AsyncOpenAI
 
 from ehs_ai.config import get_settings
+from ehs_ai.utils.http import get_http_client
 from ehs_ai.utils.logger import get_logger
+from ehs_ai.utils.rate_limit import estimate_tokens, get_rate_limiter
+from ehs_ai.vector.cache import ImageAnalysisCache
 
 logger = get_logger(__name__)
 
+_SYSTEM_PROMPT = (
+    "You are an Environmental Health & Safety investigator. "
+    "Identify visible objects, PPE usage, hazards, and likely contributions to the reported incident."
+)
+_USER_PROMPT = (
+    "Analyse this evidence image. List key objects, potential safety risks, and any mitigating or aggravating factors."
+)
+_BATCH_USER_PROMPT = (
+    "Analyse each evidence image below; every image is preceded by its item id. For each image, "
+    "list key objects, potential safety risks, and any mitigating or aggravating factors. "
+    'Respond with JSON of the form {"items": [{"id": "item_0", "analysis": "..."}]} '
+    "containing one entry per item id."
+)
+_ANALYSIS_FAILED = "Unable to complete AI analysis."
+# Upper bound for one high-detail image of at most 1024px per side (4 tiles * 170 + 85).
+_IMAGE_TOKEN_ESTIMATE = 765
+# The vision model gains nothing from inputs beyond ~1024px, so large files are downscaled.
+_DOWNSCALE_THRESHOLD_BYTES = 1024 * 1024
+_MAX_IMAGE_SIDE = 1024
+
+
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> AsyncOpenAI:
+    """OpenAI client per API key, sharing the process-wide keep-alive HTTP pool."""
+    return AsyncOpenAI(api_key=api_key, http_client=get_http_client())
+
+
+@dataclass
+class _EvidenceImage:
+    """Image evidence prepared for the vision model."""
+
+    name: str
+    fmt: str
+    width: int
+    height: int
+    fingerprint: Optional[Tuple[float, ...]]
+    content: bytes = field(repr=False)
+    data_url: Optional[str] = field(default=None, repr=False)
+
+    def encode(self) -> str:
+        """Build the base64 data URL once, downscaling large files (blocking; run in a thread)."""
+        if self.data_url is None:
+            content, fmt = self.content, self.fmt.lower()
+            if len(content) > _DOWNSCALE_THRESHOLD_BYTES:
+                content, fmt = _downscale(content), "jpeg"
+            self.data_url = f"data:image/{fmt};base64,{base64.b64encode(content).decode('ascii')}"
+        return self.data_url
+
+    def describe(self, analysis_text: str) -> str:
+        return f"Image {self.fmt} {self.width}x{self.height}px. Analysis: {analysis_text}"
+
 
 class EvidenceAnalyzer:
     """Performs AI-assisted analysis on uploaded evidence files."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, cache: ImageAnalysisCache | None = None) -> None:
         settings = get_settings()
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY must be set for evidence analysis.")
-        self._client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self._client = _get_openai_client(settings.openai_api_key)
         self._model = settings.openai_model
+        self._cache = cache
 
     async def analyse(self, path: Path) -> str:
+        prepared = await self._prepare(path)
+        if isinstance(prepared, str):
+            return prepared
+        cached = await self._cached_analysis(prepared)
+        if cached is None:
+            cached = await self._analyse_image(prepared)
+            await self._store_analysis(prepared, cached)
+        return prepared.describe(cached)
+
+    async def analyse_many(self, paths: List[Path]) -> List[str]:
+        """Analyse several evidence files with a single vision request, preserving order.
+
+        Byte-identical files are analysed once and the result is shared by every duplicate.
+        """
+        # Hash files concurrently in worker threads so disk reads overlap across attachments.
+        digests = await asyncio.gather(*(asyncio.to_thread(_file_digest, path) for path in paths))
+        keys: List[str] = []
+        unique: Dict[str, Path] = {}
+        for path, digest in zip(paths, digests, strict=True):
+            key = digest or str(path)
+            keys.append(key)
+            unique.setdefault(key, path)
+        if len(unique) < len(paths):
+            logger.info("Skipping %s duplicate evidence files.", len(paths) - len(unique))
+        analyses = dict(zip(unique, await self._analyse_unique(list(unique.values())), strict=True))
+        return [analyses[key] for key in keys]
+
+    async def _analyse_unique(self, paths: List[Path]) -> List[str]:
+        if len(paths) <= 1:
+            return [await self.analyse(path) for path in paths]
+        results: List[Optional[str]] = [None] * len(paths)
+        images: Dict[int, _EvidenceImage] = {}
+        prepared_all = await asyncio.gather(*(self._prepare(path) for path in paths))
+        for idx, prepared in enumerate(prepared_all):
+            if isinstance(prepared, str):
+                results[idx] = prepared
+            else:
+                images[idx] = prepared
+        pending: Dict[int, _EvidenceImage] = {}
+        cached_all = await asyncio.gather(
+            *(self._cached_analysis(image) for image in images.values())
+        )
+        for (idx, image), cached in zip(images.items(), cached_all, strict=True):
+            if cached is None:
+                pending[idx] = image
+            else:
+                results[idx] = image.describe(cached)
+        if pending:
+            analyses = await self._analyse_batch(list(pending.values()))
+            for idx, analysis_text in zip(pending, analyses, strict=True):
+                await self._store_analysis(pending[idx], analysis_text)
+                results[idx] = pending[idx].describe(analysis_text)
+        return [result or "Error processing evidence." for result in results]
+
+    async def _prepare(self, path: Path) -> _EvidenceImage | str:
+        """Load an evidence image off the event loop (disk read and PIL decoding block)."""
+        return await asyncio.to_thread(
+            self._read_and_probe, path, fingerprint=self._cache is not None
+        )
+
+    @staticmethod
+    def _read_and_probe(path: Path, *, fingerprint: bool) -> _EvidenceImage | str:
+        """Load an evidence image, returning a status message when it cannot be analysed."""
         if not path.exists():
             logger.warning("Evidence path %s does not exist.", path)
             return "Evidence file missing."
         try:
-            with Image.open(path) as image:
-                return await self._analyse_image(path, image)
+            # Read once; the same buffer feeds PIL probing and the data URL.
+            content = path.read_bytes()
+            with Image.open(BytesIO(content)) as image:
+                width, height = image.size
+                fmt = image.format or "unknown"
+                # The perceptual hash forces a full decode, so only pay for it with a cache.
+                image_hash = _perceptual_hash(image) if fingerprint else None
         except UnidentifiedImageError:
             return "Unsupported evidence type (non-image)."
         except Exception as exc:  # pylint: disable=broad-except
             logger.exception("Failed to analyse evidence %s: %s", path, exc)
             return "Error processing evidence."
+        return _EvidenceImage(
+            name=path.name,
+            fmt=fmt,
+            width=width,
+            height=height,
+            fingerprint=image_hash,
+            content=content,
+        )
 
-    async def _analyse_image(self, path: Path, image: Image.Image) -> str:
-        width, height = image.size
-        fmt = image.format or "unknown"
+    async def _cached_analysis(self, image: _EvidenceImage) -> Optional[str]:
+        if self._cache is None or image.fingerprint is None:
+            return None
+        try:
+            # Chroma calls are blocking; keep them off the event loop.
+            return await asyncio.to_thread(self._cache.get, image.fingerprint)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Evidence cache lookup failed for %s: %s", image.name, exc)
+            return None
 
-        encoded = base64.b64encode(path.read_bytes()).decode("utf-8")
-        data_url = f"data:image/{fmt.lower()};base64,{encoded}"
-        system_prompt = (
-            "You are an Environmental Health & Safety investigator. "
-            "Identify visible objects, PPE usage, hazards, and likely contributions to the reported incident."
-        )
-        user_prompt = (
-            "Analyse this evidence image. List key objects, potential safety risks, and any mitigating or aggravating factors."
-        )
+    async def _store_analysis(self, image: _EvidenceImage, analysis_text: str) -> None:
+        if self._cache is None or image.fingerprint is None or analysis_text == _ANALYSIS_FAILED:
+            return
         try:
+            await asyncio.to_thread(self._cache.put, image.fingerprint, analysis_text)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Evidence cache update failed for %s: %s", image.name, exc)
+
+    def _chat_request(self, image: _EvidenceImage) -> dict:
+        return {
+            "model": self._model,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": _USER_PROMPT},
+                        {"type": "image_url", "image_url": {"url": image.data_url}},
+                    ],
+                },
+            ],
+            "max_tokens": 300,
+        }
+
+    @staticmethod
+    async def _encode(image: _EvidenceImage) -> None:
+        # Only cache misses reach here, so cache hits never decode, resize or base64 the file.
+        if image.data_url is None:
+            await asyncio.to_thread(image.encode)
+
+    async def _analyse_image(self, image: _EvidenceImage) -> str:
+        try:
+            await self._encode(image)
+            await get_rate_limiter().acquire(
+                estimate_tokens(_SYSTEM_PROMPT + _USER_PROMPT) + _IMAGE_TOKEN_ESTIMATE
+            )
+            response = await self._client.chat.completions.create(**self._chat_request(image))
+            analysis_text = response.choices[0].message.content.strip()
+            if not analysis_text:
+                analysis_text = "Vision model returned no commentary."
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("OpenAI vision analysis failed for %s: %s", image.name, exc)
+            analysis_text = _ANALYSIS_FAILED
+        return analysis_text
+
+    async def _analyse_batch(self, images: List[_EvidenceImage]) -> List[str]:
+        """Analyse images in one request; items the model omits are retried individually."""
+        analyses: Dict[str, str] = {}
+        try:
+            await asyncio.gather(*(self._encode(image) for image in images))
+            content: List[dict] = [{"type": "text", "text": _BATCH_USER_PROMPT}]
+            for idx, image in enumerate(images):
+                content.append({"type": "text", "text": f"item_{idx}"})
+                content.append({"type": "image_url", "image_url": {"url": image.data_url}})
+            await get_rate_limiter().acquire(
+                estimate_tokens(_SYSTEM_PROMPT + _BATCH_USER_PROMPT)
+                + _IMAGE_TOKEN_ESTIMATE * len(images)
+            )
             response = await self._client.chat.completions.create(
                 model=self._model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": user_prompt},
-                            {"type": "image_url", "image_url": {"url": data_url}},
-                        ],
-                    },
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": content},
                 ],
-                max_tokens=300,
+                response_format={"type": "json_object"},
+                max_tokens=300 * len(images),
             )
-            analysis_text = response.choices[0].message.content.strip()
-            if not analysis_text:
-                analysis_text = "Vision model returned no commentary."
+            payload = json.loads(response.choices[0].message.content or "{}")
+            for entry in payload.get("items", []):
+                text = str(entry.get("analysis") or "").strip()
+                if text:
+                    analyses[str(entry.get("id"))] = text
         except Exception as exc:  # pylint: disable=broad-except
-            logger.exception("OpenAI vision analysis failed for %s: %s", path.name, exc)
-            analysis_text = "Unable to complete AI analysis."
+            logger.exception("Batched OpenAI vision analysis failed: %s", exc)
 
-        return (
-            f"Image {fmt} {width}x{height}px. "
-            f"Analysis: {analysis_text}"
-        )
+        missing = [idx for idx in range(len(images)) if f"item_{idx}" not in analyses]
+        if missing:
+            logger.info("Falling back to per-image analysis for %s evidence files.", len(missing))
+            retried = await asyncio.gather(*(self._analyse_image(images[idx]) for idx in missing))
+            for idx, text in zip(missing, retried, strict=True):
+                analyses[f"item_{idx}"] = text
+        return [analyses[f"item_{idx}"] for idx in range(len(images))]
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    """BLAKE2b content digest of a file, or ``None`` when it cannot be read."""
+    try:
+        with path.open("rb") as handle:
+            return hashlib.file_digest(handle, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+    except OSError:
+        return None
+
+
+def _perceptual_hash(image: Image.Image, size: int = 8) -> Tuple[float, ...]:
+    """Difference hash of the image as a +/-1 vector (64 components for the default size)."""
+    pixels = list(image.convert("L").resize((size + 1, size), Image.BILINEAR).getdata())
+    return tuple(
+        1.0 if pixels[row * (size + 1) + col] > pixels[row * (size + 1) + col + 1] else -1.0
+        for row in range(size)
+        for col in range(size)
+    )
+
+
+def _downscale(content: bytes) -> bytes:
+    """Shrink an encoded image to fit within ``_MAX_IMAGE_SIDE`` and re-encode it as JPEG."""
+    with Image.open(BytesIO(content)) as image:
+        image = image.convert("RGB")
+        image.thumbnail((_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        image.save(output, format="JPEG", quality=85)
+    return output.getvalue()
@@ -7,7 +7,7 @@ from ehs_ai.agents.incident import (
     RootCauseAgent,
     TriageAgent,
 )
-from ehs_ai.schemas import IncidentReport, IncidentWorkflowReport
+from ehs_ai.schemas import IncidentReport, IncidentWorkflowReport, IntakeSummary
 from ehs_ai.services.notifications import NotificationService
 from ehs_ai.utils.logger import get_logger
 from ehs_ai.workflow.incident_graph import IncidentWorkflowGraph
@@ -41,11 +41,21 @@ class IncidentWorkflowService:
         logger.info("Starting incident workflow for '%s'", report.title)
 
         report_result = await self._graph.run(report)
-        if hasattr(report, "attachments") and report.attachments:
-            report_result.evidence = [
-                item for item in report_result.evidence
-            ]  # ensure list exists
 
         logger.info("Completed incident workflow for '%s'", report.title)
         return report_result
 
+    async def intake_only(self, report: IncidentReport) -> IntakeSummary:
+        """Run only the intake step so it can overlap with evidence processing."""
+        logger.info("Starting incident intake for '%s'", report.title)
+        return await self._graph.run_intake(report)
+
+    async def continue_after_intake(
+        self, report: IncidentReport, intake: IntakeSummary
+    ) -> IncidentWorkflowReport:
+        """Run the remaining workflow steps using a precomputed intake summary."""
+        logger.info("Resuming incident workflow after intake for '%s'", report.title)
+        report_result = await self._graph.run(report, intake=intake)
+        logger.info("Completed incident workflow for '%s'", report.title)
+        return report_result
+
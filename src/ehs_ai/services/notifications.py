@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import uuid
+import asyncio
+import logging
+import secrets
 from typing import List
 
 from ehs_ai.schemas import EmailReceipt, NotificationPlan, NotificationResult, TicketReceipt
@@ -13,24 +15,32 @@ class NotificationService:
     """Executes ticket and email plans. Integrations are stubbed for demo purposes."""
 
     async def execute(self, plan: NotificationPlan) -> NotificationResult:
-        ticket_receipts = await self._create_tickets(plan)
-        email_receipts = await self._send_emails(plan)
+        ticket_receipts, email_receipts = await asyncio.gather(
+            self._create_tickets(plan), self._send_emails(plan)
+        )
         notes = "Tickets and emails processed via stub integrations."
         return NotificationResult(plan=plan, tickets=ticket_receipts, emails=email_receipts, notes=notes)
 
     async def _create_tickets(self, plan: NotificationPlan) -> List[TicketReceipt]:
         receipts: List[TicketReceipt] = []
-        for ticket in plan.tickets:
-            ticket_id = f"TCK-{uuid.uuid4().hex[:8].upper()}"
-            logger.info("Created ticket %s with priority %s", ticket_id, ticket.priority)
+        # One CSPRNG read for the whole plan, sliced into 8-hex-digit ids.
+        raw = secrets.token_hex(4 * len(plan.tickets)).upper()
+        log_info = logger.isEnabledFor(logging.INFO)
+        for idx, ticket in enumerate(plan.tickets):
+            ticket_id = f"TCK-{raw[idx * 8:(idx + 1) * 8]}"
+            if log_info:
+                logger.info("Created ticket %s with priority %s", ticket_id, ticket.priority)
             receipts.append(TicketReceipt(ticket_id=ticket_id, status="created", request=ticket))
         return receipts
 
     async def _send_emails(self, plan: NotificationPlan) -> List[EmailReceipt]:
         receipts: List[EmailReceipt] = []
-        for email in plan.emails:
-            message_id = f"MSG-{uuid.uuid4().hex[:10]}"
-            logger.info("Queued email to %s with subject '%s'", email.recipient, email.subject)
+        raw = secrets.token_hex(5 * len(plan.emails))
+        log_info = logger.isEnabledFor(logging.INFO)
+        for idx, email in enumerate(plan.emails):
+            message_id = f"MSG-{raw[idx * 10:(idx + 1) * 10]}"
+            if log_info:
+                logger.info("Queued email to %s with subject '%s'", email.recipient, email.subject)
             receipts.append(
                 EmailReceipt(
                     recipient=email.recipient,
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client shared by OpenAI integrations.
+
+    A single keep-alive pool (multiplexed over HTTP/2) lets every agent reuse the same
+    TCP/TLS connections instead of each provider opening its own. The pool lives for the
+    whole process and is deliberately not closed by the app lifespan: cached providers and
+    clients keep a reference, so closing it would break any later app startup in-process.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(600.0, connect=5.0),
+    )
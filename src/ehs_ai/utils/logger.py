@@ -6,6 +6,10 @@ from ehs_ai.config import get_settings
 
 def _configure_logging() -> None:
     settings = get_settings()
+    # The format never uses thread or process fields, so skip collecting them per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     dictConfig(
         {
             "version": 1,
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from functools import lru_cache
+
+from ehs_ai.config import get_settings
+
+
+class RateLimiter:
+    """Token-bucket limiter bounding LLM requests and prompt tokens per minute."""
+
+    def __init__(self, *, max_requests_per_min: int, max_tokens_per_min: int) -> None:
+        self._request_capacity = float(max_requests_per_min)
+        self._token_capacity = float(max_tokens_per_min)
+        self._request_rate = self._request_capacity / 60.0
+        self._token_rate = self._token_capacity / 60.0
+        self._requests = self._request_capacity
+        self._tokens = self._token_capacity
+        self._updated_at = time.monotonic()
+        # asyncio.Lock binds to the loop it is first contended on, so one is kept per loop
+        # (e.g. test clients or worker threads that run their own loop).
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request and ``tokens`` prompt tokens fit within the budget."""
+        needed = min(float(tokens), self._token_capacity)
+        async with self._get_lock():
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= needed:
+                    self._requests -= 1
+                    self._tokens -= needed
+                    return
+                wait = max(
+                    (1 - self._requests) / self._request_rate,
+                    (needed - self._tokens) / self._token_rate,
+                )
+                await asyncio.sleep(wait)
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._requests = min(self._request_capacity, self._requests + elapsed * self._request_rate)
+        self._tokens = min(self._token_capacity, self._tokens + elapsed * self._token_rate)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size estimate (~4 characters per token) used for rate budgeting."""
+    return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide OpenAI rate limiter."""
+    settings = get_settings()
+    return RateLimiter(
+        max_requests_per_min=settings.openai_max_requests_per_min,
+        max_tokens_per_min=settings.openai_max_tokens_per_min,
+    )
@@ -0,0 +1,80 @@
+"""Cosine top-k kernels for in-process vector search.
+
+Inputs must be L2-normalised, C-contiguous arrays: a ``float32`` query against a ``float32``,
+``float16`` or int8 (with per-row ``scales``) matrix. When numba is installed the scoring loop is
+JIT-compiled (parallel, fastmath); otherwise, and for float16, it falls back to a numpy matmul.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _jit_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        rows, dim = matrix.shape
+        out = np.empty(rows, dtype=np.float32)
+        for i in prange(rows):
+            acc = np.float32(0.0)
+            for j in range(dim):
+                acc += matrix[i, j] * query[j]
+            out[i] = acc
+        return out
+
+else:
+    _jit_scores = None
+
+
+@lru_cache(maxsize=1)
+def warmup(dim: int = 384) -> None:
+    """Compile the float32 and int8 kernels once, so real queries skip the JIT."""
+    if _jit_scores is None:
+        return
+    query = np.zeros(dim, dtype=np.float32)
+    _jit_scores(query, np.zeros((1, dim), dtype=np.float32))
+    _jit_scores(query, np.zeros((1, dim), dtype=np.int8))
+
+
+def _scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    # numba has no float16 support, so half-precision matrices always use numpy.
+    if _jit_scores is not None and matrix.dtype != np.float16:
+        return _jit_scores(query, matrix)
+    return matrix @ query
+
+
+def cosine_topk_1d(
+    query: np.ndarray, matrix: np.ndarray, k: int, *, scales: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(scores, indices)`` of the ``k`` rows of ``matrix`` most similar to ``query``."""
+    rows = matrix.shape[0]
+    k = min(k, rows)
+    if k <= 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+    scores = _scores(query, matrix)
+    if scales is not None:
+        scores = scores * scales
+    candidates = np.argpartition(-scores, k - 1)[:k] if k < rows else np.arange(rows)
+    order = candidates[np.argsort(-scores[candidates])]
+    return scores[order], order
+
+
+def cosine_topk_2d(
+    queries: np.ndarray, matrix: np.ndarray, k: int, *, scales: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched ``cosine_topk_1d``; returns ``(scores, indices)`` arrays of shape ``(q, k)``."""
+    k = min(k, matrix.shape[0])
+    scores = np.empty((queries.shape[0], k), dtype=np.float32)
+    indices = np.empty((queries.shape[0], k), dtype=np.int64)
+    for row, query in enumerate(queries):
+        scores[row], indices[row] = cosine_topk_1d(query, matrix, k, scales=scales)
+    return scores, indices
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Generic, Optional, Sequence, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from ehs_ai.utils.logger import get_logger
+from ehs_ai.vector.memory import VectorMemory
+
+logger = get_logger(__name__)
+
+OutputT = TypeVar("OutputT", bound=BaseModel)
+
+
+class SemanticCache(Generic[OutputT]):
+    """Caches structured agent outputs keyed by prompt embedding similarity."""
+
+    def __init__(
+        self,
+        vector_memory: VectorMemory,
+        *,
+        name: str,
+        output_type: Type[OutputT],
+        threshold: float = 0.92,
+        max_entries: int = 512,
+    ) -> None:
+        self._memory = vector_memory
+        self._name = name
+        self._output_type = output_type
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._collection = vector_memory.get_collection(f"agent_cache_{name}")
+
+    def get(self, prompt: str) -> Optional[OutputT]:
+        """Return a cached output for an identical or sufficiently similar prompt, if any."""
+        if not prompt or self._collection.count() == 0:
+            return None
+        entry_id = _entry_id(prompt)
+        exact = self._collection.get(ids=[entry_id], include=["metadatas"])
+        if exact["ids"]:
+            return self._load(entry_id, exact["metadatas"][0], similarity=1.0)
+        # Prompts past the embedder's window would only be compared on their opening text.
+        if not self._memory.fits_embedding_window(prompt):
+            return None
+        embedding = self._memory.embed([prompt])
+        results = self._collection.query(
+            query_embeddings=embedding,
+            n_results=1,
+            where={"exact_only": False},
+            include=["metadatas", "distances"],
+        )
+        if not results["ids"] or not results["ids"][0]:
+            return None
+        # Cache collections use cosine space, so distance is 1 - similarity.
+        similarity = 1.0 - results["distances"][0][0]
+        if similarity < self._threshold:
+            return None
+        return self._load(results["ids"][0][0], results["metadatas"][0][0], similarity=similarity)
+
+    def _load(self, entry_id: str, metadata: dict, *, similarity: float) -> Optional[OutputT]:
+        try:
+            output = self._output_type.model_validate_json(metadata["output"])
+        except (KeyError, ValidationError) as exc:
+            logger.warning("Discarding unreadable %s cache entry %s: %s", self._name, entry_id, exc)
+            self._collection.delete(ids=[entry_id])
+            return None
+        self._collection.update(
+            ids=[entry_id], metadatas=[{**metadata, "last_used_at": time.time()}]
+        )
+        logger.info("Semantic cache hit for %s agent (similarity %.3f).", self._name, similarity)
+        return output
+
+    def put(self, prompt: str, output: OutputT) -> None:
+        """Store an agent output for the given prompt, evicting least recently used entries."""
+        if not prompt:
+            return
+        embedding = self._memory.embed([prompt])
+        entry_id = _entry_id(prompt)
+        now = time.time()
+        # A truncated embedding only reflects the prompt's opening text, so such entries are
+        # excluded from similarity lookups and served on an exact id match alone.
+        exact_only = not self._memory.fits_embedding_window(prompt)
+        self._collection.upsert(
+            ids=[entry_id],
+            documents=[prompt],
+            embeddings=embedding,
+            metadatas=[
+                {
+                    "agent": self._name,
+                    "output": output.model_dump_json(),
+                    "created_at": now,
+                    "last_used_at": now,
+                    "exact_only": exact_only,
+                }
+            ],
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        overflow = self._collection.count() - self._max_entries
+        if overflow <= 0:
+            return
+        entries = self._collection.get(include=["metadatas"])
+        ranked = sorted(
+            zip(entries["ids"], entries["metadatas"]),
+            key=lambda entry: entry[1].get("last_used_at", 0.0),
+        )
+        stale_ids = [entry_id for entry_id, _ in ranked[:overflow]]
+        logger.info("Evicting %s entries from %s semantic cache.", len(stale_ids), self._name)
+        self._collection.delete(ids=stale_ids)
+
+
+def _entry_id(prompt: str) -> str:
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ImageAnalysisCache:
+    """Caches evidence image analyses keyed by a perceptual fingerprint of the image.
+
+    Fingerprints are +/-1 vectors of perceptual-hash bits, so cosine distance is
+    proportional to Hamming distance (0.15 ~= 4 of 64 bits differing).
+    """
+
+    def __init__(
+        self,
+        vector_memory: VectorMemory,
+        *,
+        max_distance: float = 0.15,
+        ttl_seconds: float = 7 * 24 * 3600,
+        purge_interval_seconds: float = 3600,
+    ) -> None:
+        self._collection = vector_memory.get_collection("evidence_cache")
+        self._max_distance = max_distance
+        self._ttl_seconds = ttl_seconds
+        self._purge_interval_seconds = purge_interval_seconds
+        self._last_purge = 0.0
+
+    def get(self, fingerprint: Sequence[float]) -> Optional[str]:
+        """Return the stored analysis for a near-identical image, if one is still fresh."""
+        if self._collection.count() == 0:
+            return None
+        results = self._collection.query(
+            query_embeddings=[list(fingerprint)],
+            n_results=1,
+            where={"ts": {"$gte": time.time() - self._ttl_seconds}},
+            include=["metadatas", "distances"],
+        )
+        if not results["ids"] or not results["ids"][0]:
+            return None
+        distance = results["distances"][0][0]
+        if distance > self._max_distance:
+            return None
+        logger.info("Evidence cache hit (cosine distance %.3f).", distance)
+        return results["metadatas"][0][0].get("analysis")
+
+    def put(self, fingerprint: Sequence[float], analysis: str) -> None:
+        """Store an analysis for the fingerprint and periodically drop expired entries."""
+        bits = "".join("1" if value > 0 else "0" for value in fingerprint)
+        entry_id = hashlib.blake2b(bits.encode("ascii"), digest_size=8).hexdigest()
+        now = time.time()
+        self._collection.upsert(
+            ids=[entry_id],
+            embeddings=[list(fingerprint)],
+            metadatas=[{"analysis": analysis, "ts": now}],
+        )
+        if now - self._last_purge >= self._purge_interval_seconds:
+            self.purge_expired()
+
+    def purge_expired(self) -> None:
+        """Delete entries older than the configured TTL."""
+        self._last_purge = time.time()
+        self._collection.delete(where={"ts": {"$lt": self._last_purge - self._ttl_seconds}})
@@ -1,28 +1,164 @@
 from __future__ import annotations
 
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Sequence, Tuple
 
 import chromadb
+import numpy as np
 from chromadb import Collection
 from sentence_transformers import SentenceTransformer
 
 from ehs_ai.config import Settings, get_settings
+from ehs_ai.utils.cache import LRUCache
 from ehs_ai.utils.logger import get_logger
+from ehs_ai.vector._similarity import cosine_topk_2d, warmup
 
 logger = get_logger(__name__)
 
+_MMAP_THRESHOLD_BYTES = 64 * 1024
+
+
+class _TransformersEmbedder:
+    """Raw Hugging Face encoder with mean pooling, mirroring ``SentenceTransformer.encode``."""
+
+    def __init__(self, model_name: str, *, max_length: int = 256) -> None:
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        self._torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self._model = AutoModel.from_pretrained(model_name).eval()
+        self.max_seq_length = max_length
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._model.config.hidden_size
+
+    def encode(
+        self,
+        texts: List[str],
+        *,
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **_: object,
+    ) -> np.ndarray:
+        torch = self._torch
+        batches: List[np.ndarray] = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), batch_size):
+                tokens = self.tokenizer(
+                    texts[start : start + batch_size],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_seq_length,
+                    return_tensors="pt",
+                )
+                hidden = self._model(**tokens).last_hidden_state
+                mask = tokens["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                if normalize_embeddings:
+                    pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+                batches.append(pooled.float().cpu().numpy())
+        if not batches:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.concatenate(batches)
+
+
+def _load_embedder(settings: Settings) -> SentenceTransformer | _TransformersEmbedder:
+    """Load the sentence embedder for the configured ``embedding_backend``."""
+    if settings.embedding_backend == "transformers":
+        return _TransformersEmbedder(settings.embedding_model_name)
+    if settings.embedding_backend == "onnx":
+        try:
+            import onnxruntime as ort
+
+            session_options = ort.SessionOptions()
+            session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            model_kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+            # The ONNX export is cached next to the vector store so it only happens once.
+            model_dir = settings.embedding_model_name.replace("/", "__")
+            export_dir = settings.vector_db_path / "onnx" / model_dir
+            if export_dir.exists():
+                return SentenceTransformer(
+                    str(export_dir), backend="onnx", model_kwargs=model_kwargs
+                )
+            embedder = SentenceTransformer(
+                settings.embedding_model_name, backend="onnx", model_kwargs=model_kwargs
+            )
+            embedder.save_pretrained(str(export_dir))
+            return embedder
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("ONNX embedding backend unavailable (%s); using PyTorch.", exc)
+    embedder = SentenceTransformer(settings.embedding_model_name)
+    if embedder.device.type == "cuda":
+        # Half precision on GPU; cosine rankings are unaffected in practice.
+        embedder.half()
+    return embedder
+
+
+@lru_cache(maxsize=8)
+def _get_client(path: str) -> chromadb.ClientAPI:
+    """Shared Chroma client per storage path, so instances reuse one SQLite handle."""
+    return chromadb.PersistentClient(path=path)
+
 
 class VectorMemory:
     """Thin wrapper around ChromaDB for storing and retrieving safety policies."""
 
     def __init__(self, *, settings: Settings | None = None) -> None:
         self._settings = settings or get_settings()
-        self._client = chromadb.PersistentClient(path=str(self._settings.vector_db_path))
-        self._collection: Collection = self._client.get_or_create_collection(
+        self._client: chromadb.ClientAPI | None = None
+        self._embedder = _load_embedder(self._settings)
+        # Per-instance caches: repeated incident text skips both the encoder and the search.
+        self._embed_cached = lru_cache(maxsize=2048)(self._embed_one)
+        self._query_cache: LRUCache[Tuple[str, int], List[dict]] = LRUCache(maxsize=512)
+        self._init_store()
+
+    def _init_store(self) -> None:
+        self._collection: Collection = self.client.get_or_create_collection(
             name=self._settings.vector_collection
         )
-        self._embedder = SentenceTransformer(self._settings.embedding_model_name)
+
+    @property
+    def client(self) -> chromadb.ClientAPI:
+        """Chroma client for the configured path, opened on first use."""
+        if self._client is None:
+            self._client = _get_client(str(self._settings.vector_db_path))
+        return self._client
+
+    def get_collection(self, name: str) -> Collection:
+        """Return an auxiliary cosine-space collection sharing this memory's client."""
+        return self.client.get_or_create_collection(
+            name=name, metadata={"hnsw:space": "cosine"}
+        )
+
+    def warmup(self) -> None:
+        """Run one throwaway forward pass so the first real query skips kernel setup."""
+        self._embedder.encode(["warmup"], show_progress_bar=False)
+
+    def fits_embedding_window(self, text: str) -> bool:
+        """Whether ``text`` embeds without truncation (longer texts only match on their start)."""
+        token_ids = self._embedder.tokenizer(text, add_special_tokens=True)["input_ids"]
+        return len(token_ids) <= self._embedder.max_seq_length
+
+    def count(self) -> int:
+        """Number of stored policy documents."""
+        return self._collection.count()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Encode texts with the configured sentence embedder, reusing cached vectors."""
+        return [list(self._embed_cached(text)) for text in texts]
+
+    def _embed_one(self, text: str) -> Tuple[float, ...]:
+        embedding = self._embedder.encode(
+            [text], show_progress_bar=False, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return tuple(embedding[0].tolist())
 
     def upsert(self, *, documents: Iterable[dict]) -> None:
         ids: List[str] = []
@@ -40,14 +176,29 @@ class VectorMemory:
         if not ids:
             return
         logger.info("Upserting %s policy documents into vector memory.", len(ids))
-        embeddings = self._embedder.encode(texts, show_progress_bar=False).tolist()
-        self._collection.upsert(ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings)
+        # One padded, batched forward pass; the numpy array is handed to Chroma as-is.
+        embeddings = self._embedder.encode(
+            texts,
+            batch_size=64,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        self._store(ids, texts, metadatas, embeddings)
+        self._query_cache.clear()
 
     def query(self, *, text: str, n_results: int = 3) -> List[dict]:
         if not text:
             return []
-        embedding = self._embedder.encode([text], show_progress_bar=False)
-        results = self._collection.query(query_embeddings=embedding, n_results=n_results)
+        return self._search(self.embed([text])[0], n_results)
+
+    def _store(
+        self, ids: List[str], texts: List[str], metadatas: List[dict], embeddings: np.ndarray
+    ) -> None:
+        self._collection.upsert(ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings)
+
+    def _search(self, embedding: Sequence[float], n_results: int) -> List[dict]:
+        results = self._collection.query(query_embeddings=[list(embedding)], n_results=n_results)
         if not results["ids"]:
             return []
         matches: List[dict] = []
@@ -67,22 +218,46 @@ class VectorMemory:
             )
         return matches
 
+    def query_cached(self, *, text: str, n_results: int = 3) -> List[dict]:
+        """Like ``query`` but memoises results per text until the next upsert."""
+        key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest(), n_results)
+        matches = self._query_cache.get(key)
+        if matches is None:
+            matches = self.query(text=text, n_results=n_results)
+            self._query_cache.put(key, matches)
+        return list(matches)
+
+    def query_formatted(
+        self, *, text: str, n_results: int = 3, template: str = "- {tag}: {document}"
+    ) -> List[str]:
+        """Return cached matches rendered with ``template`` (fields: tag, document, id)."""
+        return [
+            template.format(
+                tag=(match["metadata"] or {}).get("tag", "policy"),
+                document=match["document"],
+                id=match["id"],
+            )
+            for match in self.query_cached(text=text, n_results=n_results)
+        ]
+
     def ensure_seed_documents(self, *, directory: Path | None = None) -> None:
         """Load sample policies if the collection is empty."""
-        if self._collection.count() > 0:
+        if self.count() > 0:
             return
         docs: List[dict] = []
         source_dir = directory or Path("./storage/policies")
         if source_dir.exists():
-            for path in source_dir.glob("*.txt"):
-                text = path.read_text(encoding="utf-8")
-                docs.append(
-                    {
-                        "id": path.stem,
-                        "text": text,
-                        "metadata": {"source": str(path), "tag": "policy"},
-                    }
-                )
+            with os.scandir(source_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".txt") or not entry.is_file():
+                        continue
+                    docs.append(
+                        {
+                            "id": entry.name[: -len(".txt")],
+                            "text": _read_policy_text(entry),
+                            "metadata": {"source": entry.path, "tag": "policy"},
+                        }
+                    )
         if not docs:
             logger.info("Using built-in seed policies for vector memory.")
             docs = [
@@ -114,3 +289,185 @@ class VectorMemory:
             ]
         self.upsert(documents=docs)
 
+
+class FaissMemory(VectorMemory):
+    """Exact in-process inner-product search over a flat ``(N, dim)`` embedding matrix.
+
+    Avoids Chroma's HNSW startup and memory overhead when the corpus is a handful of
+    documents. Searches go through FAISS when installed, otherwise through the ``_similarity``
+    kernels. The matrix is held as float32, float16 or per-row scaled int8 depending on
+    ``vector_quantization``. Auxiliary caches still use Chroma collections via ``get_collection``.
+    """
+
+    def _init_store(self) -> None:
+        try:
+            import faiss  # optional dependency: pip install -e .[faiss]
+        except ImportError:
+            faiss = None
+        self._faiss = faiss
+        self._quantization = self._settings.vector_quantization
+        self._dim = self._embedder.get_sentence_embedding_dimension()
+        store_dir = self._settings.vector_db_path
+        self._vectors_path = store_dir / f"{self._settings.vector_collection}.npy"
+        self._meta_path = self._vectors_path.with_suffix(".json")
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[dict] = []
+        matrix = np.empty((0, self._dim), dtype=np.float32)
+        if self._vectors_path.exists() and self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            # Stored codes are dequantised first so a changed setting re-encodes them on load.
+            matrix = _dequantize(np.load(self._vectors_path), meta.get("scales"))
+            self._ids = meta["ids"]
+            self._documents = meta["documents"]
+            self._metadatas = meta["metadatas"]
+        self._vectors, self._scales = _quantize(matrix, self._quantization)
+        self._index = None
+        self._rebuild_index(matrix)
+        if self._index is None:
+            # Only the FAISS-less path uses the kernels; compile them here, not at import.
+            warmup(self._dim)
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def _store(
+        self, ids: List[str], texts: List[str], metadatas: List[dict], embeddings: np.ndarray
+    ) -> None:
+        vectors = _normalize(np.ascontiguousarray(embeddings, dtype=np.float32))
+        matrix = _dequantize(self._vectors, self._scales)
+        positions = {doc_id: idx for idx, doc_id in enumerate(self._ids)}
+        # Later occurrences of an id within the batch win, as with Chroma upserts.
+        latest = {
+            doc_id: (row, text, metadata)
+            for row, doc_id, text, metadata in zip(vectors, ids, texts, metadatas)
+        }
+        new_rows: List[np.ndarray] = []
+        for doc_id, (row, text, metadata) in latest.items():
+            idx = positions.get(doc_id)
+            if idx is None:
+                self._ids.append(doc_id)
+                self._documents.append(text)
+                self._metadatas.append(metadata)
+                new_rows.append(row)
+            else:
+                self._documents[idx] = text
+                self._metadatas[idx] = metadata
+                matrix[idx] = row
+        if new_rows:
+            matrix = np.ascontiguousarray(np.vstack([matrix, np.stack(new_rows)]))
+        self._vectors, self._scales = _quantize(matrix, self._quantization)
+        self._rebuild_index(matrix)
+        self._persist()
+
+    def _rebuild_index(self, matrix: np.ndarray) -> None:
+        if self._faiss is None:
+            return
+        faiss = self._faiss
+        if self._quantization == "none":
+            index = faiss.IndexFlatIP(self._dim)
+        else:
+            qtype = (
+                faiss.ScalarQuantizer.QT_fp16
+                if self._quantization == "fp16"
+                else faiss.ScalarQuantizer.QT_8bit
+            )
+            index = faiss.IndexScalarQuantizer(self._dim, qtype, faiss.METRIC_INNER_PRODUCT)
+        # QT_8bit is untrained until it sees data, and faiss rejects add() on an untrained
+        # index even for zero rows; empty stores skip both (``_search`` short-circuits).
+        if len(matrix):
+            if not index.is_trained:
+                index.train(matrix)
+            index.add(matrix)
+        self._index = index
+
+    def _search(self, embedding: Sequence[float], n_results: int) -> List[dict]:
+        if not self._ids:
+            return []
+        query = _normalize(np.ascontiguousarray([embedding], dtype=np.float32))
+        k = min(n_results, len(self._ids))
+        if self._index is not None:
+            scores, indices = self._index.search(query, k)
+        else:
+            scores, indices = cosine_topk_2d(query, self._vectors, k, scales=self._scales)
+        return [
+            {
+                "id": self._ids[idx],
+                "document": self._documents[idx],
+                "metadata": self._metadatas[idx],
+                # Cosine distance, matching the "lower is closer" contract of the Chroma path.
+                "distance": float(1.0 - score),
+            }
+            for score, idx in zip(scores[0], indices[0])
+            if idx >= 0
+        ]
+
+    def _persist(self) -> None:
+        self._vectors_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(self._vectors_path, self._vectors)
+        self._meta_path.write_text(
+            json.dumps(
+                {
+                    "ids": self._ids,
+                    "documents": self._documents,
+                    "metadatas": self._metadatas,
+                    "scales": None if self._scales is None else self._scales.tolist(),
+                }
+            ),
+            encoding="utf-8",
+        )
+
+
+def create_vector_memory(*, settings: Settings | None = None) -> VectorMemory:
+    """Build the policy memory for the configured ``vector_backend``."""
+    settings = settings or get_settings()
+    if settings.vector_backend == "faiss":
+        if importlib.util.find_spec("faiss") is None:
+            logger.info("faiss is not installed; using the built-in flat similarity search.")
+        return FaissMemory(settings=settings)
+    return VectorMemory(settings=settings)
+
+
+@lru_cache(maxsize=1)
+def get_vector_memory() -> VectorMemory:
+    """Process-wide policy memory, so the sentence embedder is loaded only once."""
+    return create_vector_memory()
+
+
+def _quantize(matrix: np.ndarray, mode: str) -> Tuple[np.ndarray, np.ndarray | None]:
+    """Encode float32 rows as ``mode`` codes, returning ``(codes, per-row scales or None)``."""
+    if mode == "fp16":
+        return np.ascontiguousarray(matrix, dtype=np.float16), None
+    if mode == "int8":
+        scales = np.abs(matrix).max(axis=1, initial=0.0) / 127.0
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        codes = np.round(matrix / scales[:, None]).astype(np.int8)
+        return np.ascontiguousarray(codes), scales
+    return np.ascontiguousarray(matrix, dtype=np.float32), None
+
+
+def _dequantize(codes: np.ndarray, scales: Sequence[float] | None) -> np.ndarray:
+    """Inverse of ``_quantize``; returns a fresh contiguous float32 matrix."""
+    matrix = np.array(codes, dtype=np.float32)
+    if scales is not None:
+        matrix *= np.asarray(scales, dtype=np.float32)[:, None]
+    return matrix
+
+
+def _read_policy_text(entry: os.DirEntry) -> str:
+    """Read a policy file as UTF-8, memory-mapping large files instead of buffering them."""
+    with open(entry.path, "rb") as handle:
+        if entry.stat().st_size <= _MMAP_THRESHOLD_BYTES:
+            text = handle.read().decode("utf-8")
+        else:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8")
+    # Match the universal-newline handling Path.read_text applied before.
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise rows in place (zero rows are left untouched)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import TypedDict
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List
 
 from langgraph.graph import END, StateGraph
 
@@ -11,28 +14,36 @@ from ehs_ai.agents.incident import (
     RootCauseAgent,
     TriageAgent,
 )
+from ehs_ai.config import get_settings
 from ehs_ai.schemas import (
     CorrectiveActionPlan,
     IncidentReport,
     IncidentWorkflowReport,
     IntakeSummary,
+    NotificationPlan,
     NotificationResult,
     RootCauseAnalysis,
     TriageAssessment,
 )
 from ehs_ai.services.notifications import NotificationService
-from ehs_ai.vector.memory import VectorMemory
+from ehs_ai.vector.memory import get_vector_memory
 
 
-class IncidentState(TypedDict, total=False):
-    """Runtime state shared across LangGraph nodes."""
+@dataclass(slots=True)
+class IncidentState:
+    """Runtime state shared across LangGraph nodes; nodes return partial update dicts.
 
-    report: IncidentReport
-    intake: IntakeSummary
-    triage: TriageAssessment
-    root_cause: RootCauseAnalysis
-    corrective_actions: CorrectiveActionPlan
-    notifications: NotificationResult
+    Fields start as ``None``; each node asserts the ones its incoming edges guarantee.
+    """
+
+    report: IncidentReport | None = None
+    intake: IntakeSummary | None = None
+    triage: TriageAssessment | None = None
+    root_cause: RootCauseAnalysis | None = None
+    policy_hits: List[str] | None = None
+    corrective_actions: CorrectiveActionPlan | None = None
+    notification_draft: NotificationPlan | None = None
+    notifications: NotificationResult | None = None
 
 
 class IncidentWorkflowGraph:
@@ -54,10 +65,15 @@ class IncidentWorkflowGraph:
         self._corrective_agent = corrective_agent
         self._notification_agent = notification_agent
         self._notification_service = notification_service
+        settings = get_settings()
+        self._speculative_notifications = settings.speculative_notifications
         self._graph = self._build_graph()
 
-    async def run(self, report: IncidentReport) -> IncidentWorkflowReport:
-        initial_state: IncidentState = {"report": report}
+    async def run(
+        self, report: IncidentReport, *, intake: IntakeSummary | None = None
+    ) -> IncidentWorkflowReport:
+        initial_state = IncidentState(report=report, intake=intake)
+        # LangGraph returns the final channel values as a plain dict.
         final_state = await self._graph.ainvoke(initial_state)
         return IncidentWorkflowReport(
             incident=report,
@@ -68,67 +84,157 @@ class IncidentWorkflowGraph:
             notifications=final_state["notifications"],
         )
 
+    async def run_intake(self, report: IncidentReport) -> IntakeSummary:
+        return await self._intake_agent.process(report)
+
     def _build_graph(self):
         graph = StateGraph(IncidentState)
         graph.add_node("intake", self._intake_node)
         graph.add_node("triage", self._triage_node)
         graph.add_node("root_cause", self._root_cause_node)
+        graph.add_node("policy_prep", self._policy_prep_node)
+        graph.add_node("notify_draft", self._notify_draft_node)
         graph.add_node("corrective", self._corrective_node)
         graph.add_node("notify", self._notify_node)
 
+        # Triage, root cause and policy retrieval only depend on intake, so they fan out
+        # in parallel and join before corrective planning. A draft notification plan is
+        # built from triage alongside corrective planning and reconciled in "notify".
         graph.add_edge("intake", "triage")
-        graph.add_edge("triage", "root_cause")
-        graph.add_edge("root_cause", "corrective")
-        graph.add_edge("corrective", "notify")
+        graph.add_edge("intake", "root_cause")
+        graph.add_edge("intake", "policy_prep")
+        graph.add_edge("triage", "notify_draft")
+        graph.add_edge(["triage", "root_cause", "policy_prep"], "corrective")
+        graph.add_edge(["corrective", "notify_draft"], "notify")
         graph.add_edge("notify", END)
 
         graph.set_entry_point("intake")
         return graph.compile()
 
-    async def _intake_node(self, state: IncidentState) -> IncidentState:
-        report = state["report"]
+    async def _intake_node(self, state: IncidentState) -> Dict[str, Any]:
+        if state.intake is not None:
+            # Intake was computed ahead of the graph run (see IncidentWorkflowService).
+            return {}
+        report = state.report
+        assert report is not None
         intake = await self._intake_agent.process(report)
         return {"intake": intake}
 
-    async def _triage_node(self, state: IncidentState) -> IncidentState:
-        report = state["report"]
-        intake = state["intake"]
+    async def _triage_node(self, state: IncidentState) -> Dict[str, Any]:
+        report = state.report
+        intake = state.intake
+        assert report is not None
+        assert intake is not None
         triage = await self._triage_agent.assess(report, intake)
         return {"triage": triage}
 
-    async def _root_cause_node(self, state: IncidentState) -> IncidentState:
-        report = state["report"]
-        intake = state["intake"]
-        triage = state["triage"]
-        root_cause = await self._root_cause_agent.analyse(report, intake, triage)
+    async def _root_cause_node(self, state: IncidentState) -> Dict[str, Any]:
+        report = state.report
+        intake = state.intake
+        assert report is not None
+        assert intake is not None
+        root_cause = await self._root_cause_agent.analyse(report, intake)
         return {"root_cause": root_cause}
 
-    async def _corrective_node(self, state: IncidentState) -> IncidentState:
-        report = state["report"]
-        intake = state["intake"]
-        triage = state["triage"]
-        root_cause = state["root_cause"]
-        corrective_actions = await self._corrective_agent.plan(report, intake, triage, root_cause)
+    async def _policy_prep_node(self, state: IncidentState) -> Dict[str, Any]:
+        report = state.report
+        intake = state.intake
+        assert report is not None
+        assert intake is not None
+        # Embedding and vector search are blocking; run them off the event loop so they
+        # overlap with the triage and root cause LLM calls.
+        policy_hits = await asyncio.to_thread(
+            self._corrective_agent.retrieve_policies, report, intake
+        )
+        return {"policy_hits": policy_hits}
+
+    async def _corrective_node(self, state: IncidentState) -> Dict[str, Any]:
+        report = state.report
+        intake = state.intake
+        triage = state.triage
+        root_cause = state.root_cause
+        assert report is not None
+        assert intake is not None
+        assert triage is not None
+        assert root_cause is not None
+        corrective_actions = await self._corrective_agent.plan(
+            report, intake, triage, root_cause, policy_hits=state.policy_hits
+        )
         return {"corrective_actions": corrective_actions}
 
-    async def _notify_node(self, state: IncidentState) -> IncidentState:
-        report = state["report"]
-        intake = state["intake"]
-        triage = state["triage"]
-        corrective_actions = state["corrective_actions"]
-        notification_plan = await self._notification_agent.plan(
-            report, intake, triage, corrective_actions
+    async def _notify_draft_node(self, state: IncidentState) -> Dict[str, Any]:
+        if not self._speculative_notifications:
+            return {}
+        report = state.report
+        intake = state.intake
+        triage = state.triage
+        assert report is not None
+        assert intake is not None
+        assert triage is not None
+        draft = await self._notification_agent.plan(
+            report, intake, triage, _placeholder_actions(triage)
         )
+        return {"notification_draft": draft}
+
+    async def _notify_node(self, state: IncidentState) -> Dict[str, Any]:
+        report = state.report
+        intake = state.intake
+        triage = state.triage
+        corrective_actions = state.corrective_actions
+        draft = state.notification_draft
+        assert report is not None
+        assert intake is not None
+        assert triage is not None
+        assert corrective_actions is not None
+        if draft is None:
+            notification_plan = await self._notification_agent.plan(
+                report, intake, triage, corrective_actions
+            )
+        elif _missing_parties(draft, corrective_actions):
+            notification_plan = await self._notification_agent.refine(
+                draft, corrective_actions
+            )
+        else:
+            notification_plan = draft
         notifications = await self._notification_service.execute(notification_plan)
         return {"notifications": notifications}
 
 
+def _placeholder_actions(triage: TriageAssessment) -> CorrectiveActionPlan:
+    """Approximate the corrective plan from triage output for speculative notification drafts."""
+    return CorrectiveActionPlan(
+        actions=triage.priority_actions,
+        responsible_parties=triage.escalation_channels,
+        due_dates=[],
+        policy_references=[],
+    )
+
+
+def _missing_parties(draft: NotificationPlan, final: CorrectiveActionPlan) -> bool:
+    """True when the final plan names responsible parties the draft never addresses.
+
+    Action wording differs between independent generations, so only a new owner who would
+    otherwise go unnotified justifies the extra refine call.
+    """
+    drafted = " ".join(
+        [ticket.title + " " + ticket.description for ticket in draft.tickets]
+        + [email.recipient + " " + email.subject + " " + email.body for email in draft.emails]
+    ).casefold()
+    return any(
+        party.strip().casefold() not in drafted
+        for party in final.responsible_parties
+        if party.strip()
+    )
+
+
+@lru_cache(maxsize=1)
 def compile_graph() -> StateGraph:
+    """Compiled workflow graph, built once per process."""
     graph_instance = IncidentWorkflowGraph(
         intake_agent=IntakeAgent(),
         triage_agent=TriageAgent(),
         root_cause_agent=RootCauseAgent(),
-        corrective_agent=CorrectiveActionAgent(vector_memory=VectorMemory()),
+        corrective_agent=CorrectiveActionAgent(vector_memory=get_vector_memory()),
         notification_agent=NotificationAgent(),
         notification_service=NotificationService(),
     )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
+from ehs_ai.config import Settings  # noqa: E402
+from ehs_ai.vector import memory  # noqa: E402
+
+_DIM = 8
+
+
+class _FakeEmbedder:
+    """Deterministic stand-in for the sentence embedder (one-hot by text hash)."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return _DIM
+
+    def encode(self, texts: List[str], **_: object) -> np.ndarray:
+        vectors = np.zeros((len(texts), _DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, sum(text.encode("utf-8")) % _DIM] = 1.0
+            vectors[row, len(text) % _DIM] += 0.5
+        return vectors
+
+
+@pytest.fixture
+def make_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory, "_load_embedder", lambda settings: _FakeEmbedder())
+
+    def _make(quantization: str) -> memory.FaissMemory:
+        settings = Settings(
+            vector_db_path=tmp_path,
+            vector_backend="faiss",
+            vector_quantization=quantization,
+        )
+        return memory.FaissMemory(settings=settings)
+
+    return _make
+
+
+@pytest.mark.parametrize("quantization", ["none", "fp16", "int8"])
+def test_empty_store_starts_and_returns_no_matches(make_memory, quantization):
+    store = make_memory(quantization)
+
+    assert store.count() == 0
+    assert store.query(text="forklift collision") == []
+
+
+def test_int8_round_trip_survives_reload(make_memory):
+    docs = [
+        {"id": "ppe", "text": "Wear hard hats", "metadata": {"tag": "PPE"}},
+        {"id": "loto", "text": "Lock out energy sources", "metadata": {"tag": "LOTO"}},
+        {"id": "chem", "text": "Use splash-resistant gloves", "metadata": {"tag": "Chemical"}},
+    ]
+    store = make_memory("int8")
+    store.upsert(documents=docs)
+
+    reloaded = make_memory("int8")
+
+    assert reloaded.count() == len(docs)
+    assert reloaded._vectors.dtype == np.int8
+    for doc in docs:
+        best = reloaded.query(text=doc["text"], n_results=1)[0]
+        assert best["id"] == doc["id"]
+        assert best["distance"] == pytest.approx(0.0, abs=0.02)
+
+
+def test_int8_quantization_is_close_to_float32():
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((16, _DIM)).astype(np.float32)
+
+    codes, scales = memory._quantize(matrix, "int8")
+
+    assert codes.dtype == np.int8
+    np.testing.assert_allclose(memory._dequantize(codes, scales), matrix, atol=0.05)